@@ -45,16 +45,42 @@ def list_databases(connection):
     finally:
         cursor.close()
 
+def quote_identifier(name):
+    # Double any embedded backticks so the name stays a single identifier
+    return "`" + name.replace("`", "``") + "`"
+
 def drop_database(connection, db_name):
     cursor = connection.cursor()
     try:
-        cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
+        cursor.execute(f"DROP DATABASE IF EXISTS {quote_identifier(db_name)}")
         logger.info(f"Dropped database {db_name}")
     except Exception as e:
         logger.error(f"Error dropping database {db_name}: {e}")
     finally:
         cursor.close()
 
+def drop_databases(connection, db_names):
+    cursor = connection.cursor()
+    dropped = 0
+    try:
+        # Send all DROP statements in a single round-trip
+        statements = ";".join(f"DROP DATABASE IF EXISTS {quote_identifier(db_name)}" for db_name in db_names)
+        # Drain every result; the generator comes first so it is fully consumed
+        for _, db_name in zip(cursor.execute(statements, multi=True), db_names):
+            logger.info(f"Dropped database {db_name}")
+            dropped += 1
+    except Exception as e:
+        # The server stops at the first failing statement
+        remaining = db_names[dropped + 1:]
+        logger.error(f"Error dropping database {db_names[dropped]}: {e}")
+        if remaining:
+            logger.info(f"Dropping remaining databases one by one: {', '.join(remaining)}")
+    finally:
+        cursor.close()
+    
+    for db_name in db_names[dropped + 1:]:
+        drop_database(connection, db_name)
+
 def main():
     # Connect to the database
     connection = connect_to_db()
@@ -80,8 +106,7 @@ def main():
         return
     
     # Drop benchmark databases
-    for db in benchmark_dbs:
-        drop_database(connection, db)
+    drop_databases(connection, benchmark_dbs)
     
     # Close the connection
     connection.close()
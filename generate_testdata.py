@@ -4,9 +4,13 @@
 import os
 import logging
 from dotenv import load_dotenv
-import mysql.connector
+from mysql.connector.pooling import MySQLConnectionPool
 from faker import Faker
 import random
+from itertools import chain, islice
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 load_dotenv()
 
@@ -28,22 +32,67 @@ NUM_PRODUCTS = int(os.getenv("BENCHMARK_NUM_PRODUCTS"))
 NUM_ORDERS = int(os.getenv("BENCHMARK_NUM_ORDERS"))
 NUM_ORDER_ITEMS = int(os.getenv("BENCHMARK_NUM_ORDER_ITEMS"))
 
+# Rows are generated lazily in chunks of this size to bound memory use
+GENERATION_CHUNK_SIZE = 10000
+
+# Column order of the row tuples produced by the generate_*_data functions
+USER_COLUMNS = ("username", "email", "first_name", "last_name", "status")
+PRODUCT_COLUMNS = ("name", "description", "price", "category", "stock")
+ORDER_COLUMNS = ("user_id", "status", "total_amount", "shipping_address", "payment_method")
+ORDER_ITEM_COLUMNS = ("order_id", "product_id", "quantity", "price")
+
+USER_STATUSES = ("active", "inactive", "suspended")
+PRODUCT_CATEGORIES = (
+    "Electronics", "Clothing", "Books", "Home", "Sports",
+    "Beauty", "Toys", "Food", "Health", "Automotive"
+)
+ORDER_STATUSES = ("pending", "processing", "shipped", "delivered", "cancelled")
+PAYMENT_METHODS = ("credit_card", "paypal", "bank_transfer", "cash_on_delivery")
+
 fake = Faker()
+rng = np.random.default_rng()
+
+# Pre-sampled pools for the hot per-row fields. Sampling these with
+# random.choices avoids a Faker provider dispatch for every generated row.
+POOL_SIZE = 2000
+_usernames = [fake.user_name() for _ in range(POOL_SIZE)]
+_emails = [fake.email() for _ in range(POOL_SIZE)]
+_first_names = [fake.first_name() for _ in range(POOL_SIZE)]
+_last_names = [fake.last_name() for _ in range(POOL_SIZE)]
+_addresses = [fake.address() for _ in range(POOL_SIZE)]
+_product_names = [fake.catch_phrase() for _ in range(POOL_SIZE)]
+# Faker.text is the slowest provider; descriptions need not be unique
+_descriptions = [fake.text(max_nb_chars=200) for _ in range(500)]
 
-def connect_to_db():
+def create_connection_pool(pool_size):
     try:
-        connection = mysql.connector.connect(
+        pool = MySQLConnectionPool(
+            pool_name="gen",
+            pool_size=pool_size,
             host=DB_HOST,
             user=DB_USER,
             password=DB_PASSWORD,
-            port=DB_PORT
+            port=DB_PORT,
+            use_pure=False
         )
-        logger.info(f"Connected to {DB_HOST}")
-        return connection
+        logger.info(f"Connected to {DB_HOST} with {pool_size} pooled connection(s)")
+        return pool
     except Exception as e:
         logger.error(f"Error connecting to database: {e}")
         raise
 
+def get_auto_increment_increment(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SHOW VARIABLES LIKE 'auto_increment_increment'")
+        row = cursor.fetchone()
+        return int(row[1]) if row else 1
+    except Exception as e:
+        logger.error(f"Error reading auto_increment_increment: {e}")
+        raise
+    finally:
+        cursor.close()
+
 def create_database(connection, db_name):
     cursor = connection.cursor()
     try:
@@ -56,77 +105,66 @@ def create_database(connection, db_name):
     finally:
         cursor.close()
 
+# All table definitions, sent to the server as one multi-statement.
+# Indexes backing foreign keys stay inline; the other secondary indexes
+# are added by SECONDARY_INDEXES_DDL once the data is loaded.
+TABLE_NAMES = ("users", "products", "orders", "order_items")
+TABLES_DDL = """
+CREATE TABLE users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(50) NOT NULL,
+    email VARCHAR(100) NOT NULL,
+    first_name VARCHAR(50),
+    last_name VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status ENUM('active', 'inactive', 'suspended') DEFAULT 'active'
+);
+CREATE TABLE products (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    description TEXT,
+    price DECIMAL(10,2) NOT NULL,
+    category VARCHAR(50),
+    stock INT DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE orders (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status ENUM('pending', 'processing', 'shipped', 'delivered', 'cancelled') DEFAULT 'pending',
+    total_amount DECIMAL(10,2) NOT NULL,
+    shipping_address TEXT,
+    payment_method VARCHAR(50),
+    INDEX idx_user_id (user_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+CREATE TABLE order_items (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    order_id INT NOT NULL,
+    product_id INT NOT NULL,
+    quantity INT NOT NULL DEFAULT 1,
+    price DECIMAL(10,2) NOT NULL,
+    INDEX idx_order_id (order_id),
+    INDEX idx_product_id (product_id),
+    FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE,
+    FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
+)
+"""
+
+SECONDARY_INDEXES_DDL = """
+ALTER TABLE users ADD INDEX idx_email (email), ADD INDEX idx_status (status), ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE products ADD INDEX idx_category (category), ADD INDEX idx_price (price), ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE orders ADD INDEX idx_status (status), ALGORITHM=INPLACE, LOCK=NONE
+"""
+
 def create_tables(connection, db_name):
     """Create tables."""
     cursor = connection.cursor()
     try:
-        # Use the database
-        cursor.execute(f"USE {db_name}")
-        
-        # Create users table
-        cursor.execute("""
-        CREATE TABLE users (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            username VARCHAR(50) NOT NULL,
-            email VARCHAR(100) NOT NULL,
-            first_name VARCHAR(50),
-            last_name VARCHAR(50),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status ENUM('active', 'inactive', 'suspended') DEFAULT 'active',
-            INDEX idx_email (email),
-            INDEX idx_status (status)
-        )
-        """)
-        logger.info(f"Created table {db_name}.users")
-        
-        # Create products table
-        cursor.execute("""
-        CREATE TABLE products (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(100) NOT NULL,
-            description TEXT,
-            price DECIMAL(10,2) NOT NULL,
-            category VARCHAR(50),
-            stock INT DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            INDEX idx_category (category),
-            INDEX idx_price (price)
-        )
-        """)
-        logger.info(f"Created table {db_name}.products")
-        
-        # Create orders table
-        cursor.execute("""
-        CREATE TABLE orders (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            user_id INT NOT NULL,
-            order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status ENUM('pending', 'processing', 'shipped', 'delivered', 'cancelled') DEFAULT 'pending',
-            total_amount DECIMAL(10,2) NOT NULL,
-            shipping_address TEXT,
-            payment_method VARCHAR(50),
-            INDEX idx_user_id (user_id),
-            INDEX idx_status (status),
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        )
-        """)
-        logger.info(f"Created table {db_name}.orders")
-        
-        # Create order_items table
-        cursor.execute("""
-        CREATE TABLE order_items (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            order_id INT NOT NULL,
-            product_id INT NOT NULL,
-            quantity INT NOT NULL DEFAULT 1,
-            price DECIMAL(10,2) NOT NULL,
-            INDEX idx_order_id (order_id),
-            INDEX idx_product_id (product_id),
-            FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE,
-            FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
-        )
-        """)
-        logger.info(f"Created table {db_name}.order_items")
+        # Create all tables in a single round-trip, draining every result
+        for _, table_name in zip(cursor.execute(TABLES_DDL, multi=True), TABLE_NAMES):
+            logger.info(f"Created table {db_name}.{table_name}")
         
     except Exception as e:
         logger.error(f"Error creating tables: {e}")
@@ -134,102 +172,141 @@ def create_tables(connection, db_name):
     finally:
         cursor.close()
 
-def insert_data(connection, db_name, table_name, data_list, batch_size=1000):
-    if not data_list:
-        return []
+def add_secondary_indexes(connection, db_name):
+    """Add the secondary indexes once the tables are loaded."""
+    cursor = connection.cursor()
+    try:
+        for _ in cursor.execute(SECONDARY_INDEXES_DDL, multi=True):
+            pass
+        logger.info(f"Created secondary indexes in {db_name}")
+    except Exception as e:
+        logger.error(f"Error creating indexes: {e}")
+        raise
+    finally:
+        cursor.close()
+
+# Session variables changed for the duration of a bulk load
+BULK_LOAD_SETTINGS = ("autocommit", "unique_checks", "foreign_key_checks")
+
+def begin_bulk_load(connection):
+    """Disable per-row checks and autocommit so a database loads in one transaction.
     
+    Returns the previous session values for end_bulk_load to restore.
+    """
     cursor = connection.cursor()
     try:
-        # Use the database
-        cursor.execute(f"USE {db_name}")
-        
-        # Prepare the insert query
-        columns = ", ".join(data_list[0].keys())
-        placeholders = ", ".join(["%s"] * len(data_list[0]))
+        cursor.execute("SELECT " + ", ".join(f"@@SESSION.{name}" for name in BULK_LOAD_SETTINGS))
+        saved = dict(zip(BULK_LOAD_SETTINGS, cursor.fetchone()))
         
-        # Insert data in batches
+        cursor.execute("SET SESSION unique_checks=0")
+        cursor.execute("SET SESSION foreign_key_checks=0")
+        cursor.execute("SET SESSION autocommit=0")
+        return saved
+    except Exception as e:
+        logger.error(f"Error preparing bulk load: {e}")
+        raise
+    finally:
+        cursor.close()
+
+def end_bulk_load(connection, saved):
+    """Commit the bulk load and restore the session values saved by begin_bulk_load."""
+    cursor = connection.cursor()
+    try:
+        connection.commit()
+        for name, value in saved.items():
+            cursor.execute(f"SET SESSION {name}={int(value)}")
+    except Exception as e:
+        logger.error(f"Error finishing bulk load: {e}")
+        raise
+    finally:
+        cursor.close()
+
+# Multi-row INSERT statements, keyed by (table_name, columns, row_count). Table
+# names are unqualified so every database shares the same statements; the
+# schema is selected with cmd_init_db in build_database.
+_sql_cache = {}
+
+def get_insert_sql(table_name, columns, row_count):
+    key = (table_name, columns, row_count)
+    sql = _sql_cache.get(key)
+    if sql is None:
+        row_placeholders = f"({', '.join(['%s'] * len(columns))})"
+        values = ", ".join([row_placeholders] * row_count)
+        sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES {values}"
+        _sql_cache[key] = sql
+    return sql
+
+def insert_data(connection, db_name, table_name, columns, rows, id_step=1, batch_size=1000, collect_ids=True):
+    cursor = connection.cursor()
+    try:
+        # Insert data in batches, pulling rows from the generator as we go
         inserted_ids = []
+        row_count = 0
+        rows = iter(rows)
         
-        for i in range(0, len(data_list), batch_size):
-            batch = data_list[i:i + batch_size]
-            
-            # Build multi-row insert query
-            values_list = []
-            params = []
-            for data in batch:
-                values_list.append(f"({placeholders})")
-                params.extend(data.values())
-            
-            query = f"INSERT INTO {table_name} ({columns}) VALUES {', '.join(values_list)}"
-            cursor.execute(query, params)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
             
-            # Get the first ID of this batch
-            first_id = cursor.lastrowid
+            # Full batches share one cached statement; only the last batch may differ
+            query = get_insert_sql(table_name, columns, len(batch))
+            cursor.execute(query, list(chain.from_iterable(batch)))
+            row_count += len(batch)
             
-            # Generate IDs for this batch (auto_increment IDs are sequential)
-            for j in range(len(batch)):
-                inserted_ids.append(first_id + j)
-        
-        # Commit the transaction
-        connection.commit()
+            # Only keep IDs that later tables reference; otherwise just count rows
+            if collect_ids:
+                # Get the first ID of this batch
+                first_id = cursor.lastrowid
+                
+                # Generate IDs for this batch (auto_increment IDs are sequential,
+                # spaced by auto_increment_increment)
+                inserted_ids.extend(range(first_id, first_id + len(batch) * id_step, id_step))
         
-        # Verify the IDs by querying the table
-        cursor.execute(f"SELECT id FROM {table_name} ORDER BY id")
-        actual_ids = [row[0] for row in cursor.fetchall()]
-        
-        logger.info(f"Inserted {len(actual_ids)} rows into {db_name}.{table_name}")
-        return actual_ids
+        logger.info(f"Inserted {row_count} rows into {db_name}.{table_name}")
+        return inserted_ids
     except Exception as e:
         logger.error(f"Error inserting data into {table_name}: {e}")
         raise
     finally:
         cursor.close()
 
+def chunk_sizes(count, chunk_size=GENERATION_CHUNK_SIZE):
+    for start in range(0, count, chunk_size):
+        yield min(chunk_size, count - start)
+
 def generate_user_data(count=10):
-    users = []
-    for _ in range(count):
-        users.append({
-            "username": fake.user_name(),
-            "email": fake.email(),
-            "first_name": fake.first_name(),
-            "last_name": fake.last_name(),
-            "status": random.choice(["active", "inactive", "suspended"])
-        })
-    return users
+    for size in chunk_sizes(count):
+        usernames = random.choices(_usernames, k=size)
+        emails = random.choices(_emails, k=size)
+        first_names = random.choices(_first_names, k=size)
+        last_names = random.choices(_last_names, k=size)
+        statuses = random.choices(USER_STATUSES, k=size)
+        
+        yield from zip(usernames, emails, first_names, last_names, statuses)
 
 def generate_product_data(count=20):
-    products = []
-    for _ in range(count):
-        products.append({
-            "name": fake.catch_phrase(),
-            "description": fake.text(max_nb_chars=200),
-            "price": round(random.uniform(5, 1000), 2),
-            "category": random.choice([
-                "Electronics", "Clothing", "Books", "Home", "Sports",
-                "Beauty", "Toys", "Food", "Health", "Automotive"
-            ]),
-            "stock": random.randint(0, 1000)
-        })
-    return products
+    for size in chunk_sizes(count):
+        names = random.choices(_product_names, k=size)
+        descriptions = random.choices(_descriptions, k=size)
+        prices = rng.uniform(5, 1000, size=size).round(2).tolist()
+        categories = random.choices(PRODUCT_CATEGORIES, k=size)
+        stocks = rng.integers(0, 1001, size=size).tolist()
+        
+        yield from zip(names, descriptions, prices, categories, stocks)
 
 def generate_order_data(count=15, user_ids=None):
     if not user_ids:
         user_ids = [1]
     
-    orders = []
-    for _ in range(count):
-        orders.append({
-            "user_id": random.choice(user_ids),
-            "status": random.choice([
-                "pending", "processing", "shipped", "delivered", "cancelled"
-            ]),
-            "total_amount": round(random.uniform(10, 5000), 2),
-            "shipping_address": fake.address(),
-            "payment_method": random.choice([
-                "credit_card", "paypal", "bank_transfer", "cash_on_delivery"
-            ])
-        })
-    return orders
+    for size in chunk_sizes(count):
+        order_user_ids = random.choices(user_ids, k=size)
+        statuses = random.choices(ORDER_STATUSES, k=size)
+        total_amounts = rng.uniform(10, 5000, size=size).round(2).tolist()
+        addresses = random.choices(_addresses, k=size)
+        payment_methods = random.choices(PAYMENT_METHODS, k=size)
+        
+        yield from zip(order_user_ids, statuses, total_amounts, addresses, payment_methods)
 
 def generate_order_item_data(count=30, order_ids=None, product_ids=None):
     if not order_ids:
@@ -237,53 +314,73 @@ def generate_order_item_data(count=30, order_ids=None, product_ids=None):
     if not product_ids:
         product_ids = [1]
     
-    order_items = []
-    for _ in range(count):
-        quantity = random.randint(1, 10)
-        price = round(random.uniform(5, 500), 2)
-        order_items.append({
-            "order_id": random.choice(order_ids),
-            "product_id": random.choice(product_ids),
-            "quantity": quantity,
-            "price": price
-        })
-    return order_items
+    for size in chunk_sizes(count):
+        item_order_ids = random.choices(order_ids, k=size)
+        item_product_ids = random.choices(product_ids, k=size)
+        quantities = rng.integers(1, 11, size=size).tolist()
+        prices = rng.uniform(5, 500, size=size).round(2).tolist()
+        
+        yield from zip(item_order_ids, item_product_ids, quantities, prices)
 
-def main():
-    # Connect to the database
-    connection = connect_to_db()
-    
-    logger.info(f"Creating {NUM_DATABASES} database(s) with test data...")
-    
-    # Create multiple databases
-    for db_num in range(1, NUM_DATABASES + 1):
-        db_name = f"{DB_PREFIX}test{db_num}"
+def build_database(pool, db_num):
+    db_name = f"{DB_PREFIX}test{db_num}"
+    connection = pool.get_connection()
+    try:
+        id_step = get_auto_increment_increment(connection)
         
         logger.info(f"Creating database {db_num}/{NUM_DATABASES}: {db_name}")
         
         # Create database
         create_database(connection, db_name)
         
+        # Make it the default schema for the rest of this connection's work;
+        # the pooled wrapper does not forward attribute assignment
+        connection.cmd_init_db(db_name)
+        
         # Create tables
         create_tables(connection, db_name)
         
+        # Load all tables in a single transaction
+        saved_settings = begin_bulk_load(connection)
+        
         # Insert data
-        logger.info(f"  Inserting {NUM_USERS} users...")
-        user_ids = insert_data(connection, db_name, "users", generate_user_data(NUM_USERS))
+        logger.info(f"  {db_name}: inserting {NUM_USERS} users...")
+        user_ids = insert_data(connection, db_name, "users", USER_COLUMNS, generate_user_data(NUM_USERS), id_step)
         
-        logger.info(f"  Inserting {NUM_PRODUCTS} products...")
-        product_ids = insert_data(connection, db_name, "products", generate_product_data(NUM_PRODUCTS))
+        logger.info(f"  {db_name}: inserting {NUM_PRODUCTS} products...")
+        product_ids = insert_data(connection, db_name, "products", PRODUCT_COLUMNS, generate_product_data(NUM_PRODUCTS), id_step)
         
-        logger.info(f"  Inserting {NUM_ORDERS} orders...")
-        order_ids = insert_data(connection, db_name, "orders", generate_order_data(NUM_ORDERS, user_ids))
+        logger.info(f"  {db_name}: inserting {NUM_ORDERS} orders...")
+        order_ids = insert_data(connection, db_name, "orders", ORDER_COLUMNS, generate_order_data(NUM_ORDERS, user_ids), id_step)
         
-        logger.info(f"  Inserting {NUM_ORDER_ITEMS} order items...")
-        insert_data(connection, db_name, "order_items", generate_order_item_data(NUM_ORDER_ITEMS, order_ids, product_ids))
+        logger.info(f"  {db_name}: inserting {NUM_ORDER_ITEMS} order items...")
+        insert_data(connection, db_name, "order_items", ORDER_ITEM_COLUMNS, generate_order_item_data(NUM_ORDER_ITEMS, order_ids, product_ids), id_step, collect_ids=False)
+        
+        end_bulk_load(connection, saved_settings)
+        
+        # ALTER TABLE commits implicitly, so indexes are added after the load transaction
+        add_secondary_indexes(connection, db_name)
         
         logger.info(f"Database {db_name} completed successfully")
+    finally:
+        # Return the connection to the pool
+        connection.close()
+
+def main():
+    if NUM_DATABASES < 1:
+        logger.info("No databases to create")
+        return
+    
+    # Databases are independent, so build them concurrently
+    pool_size = min(NUM_DATABASES, 16)
+    pool = create_connection_pool(pool_size)
+    
+    logger.info(f"Creating {NUM_DATABASES} database(s) with test data...")
+    
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        # Consume the results so errors from any worker are raised here
+        list(executor.map(partial(build_database, pool), range(1, NUM_DATABASES + 1)))
     
-    # Close the connection
-    connection.close()
     logger.info(f"All {NUM_DATABASES} database(s) created successfully")
 
 if __name__ == "__main__":
@@ -4,11 +4,11 @@
 import os
 import time
 import logging
-import statistics
 from dotenv import load_dotenv
-import mysql.connector
+from mysql.connector.pooling import MySQLConnectionPool, CNX_POOL_MAXSIZE
 import random
-from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 load_dotenv()
 logging.basicConfig(
@@ -25,24 +25,45 @@ DB_PREFIX = os.getenv("BENCHMARK_DB_PREFIX")
 NUM_DATABASES = int(os.getenv("BENCHMARK_NUM_DATABASES"))
 NUM_THREADS = int(os.getenv("BENCHMARK_THREADS"))
 QUERIES_PER_THREAD = int(os.getenv("BENCHMARK_QUERIES_PER_THREAD"))
+INSERT_BATCH_SIZE = int(os.getenv("BENCHMARK_INSERT_BATCH_SIZE", "100"))
+THINK_TIME_MS = int(os.getenv("BENCHMARK_THINK_TIME_MS", "0"))
 
 DB_NAMES = [f"{DB_PREFIX}test{i}" for i in range(1, NUM_DATABASES + 1)]
+QUERY_TYPES = ("SELECT", "INSERT", "UPDATE")
 
-def run_benchmark_thread(thread_id):
+def create_connection_pools(size):
+    """Open one pooled connection per thread."""
+    # A pool holds at most CNX_POOL_MAXSIZE connections, so thread N
+    # uses pools[N // CNX_POOL_MAXSIZE]
+    try:
+        pools = []
+        for offset in range(0, size, CNX_POOL_MAXSIZE):
+            pools.append(MySQLConnectionPool(
+                pool_name=f"bench{len(pools)}",
+                pool_size=min(CNX_POOL_MAXSIZE, size - offset),
+                pool_reset_session=False,
+                host=DB_HOST,
+                user=DB_USER,
+                password=DB_PASSWORD,
+                port=DB_PORT
+            ))
+        logger.info(f"Connected to {DB_HOST} with {size} pooled connection(s)")
+        return pools
+    except Exception as e:
+        logger.error(f"Error connecting to database: {e}")
+        raise
+
+def run_benchmark_thread(thread_id, pools):
     try:
         # Select a random database from the list
         db_name = random.choice(DB_NAMES)
         
-        # Connect to database
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            port=DB_PORT,
-            database=db_name
-        )
+        # Take an already established connection from the pool
+        connection = pools[thread_id // CNX_POOL_MAXSIZE].get_connection()
+        # The pooled wrapper only forwards method calls, so select the schema explicitly
+        connection.cmd_init_db(db_name)
         logger.debug(f"Thread {thread_id} connected to {db_name}")
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
         query_times = []
         errors = 0
@@ -50,10 +71,17 @@ def run_benchmark_thread(thread_id):
         # Run queries
         for i in range(QUERIES_PER_THREAD):
             # Choose query type
-            query_type = random.choice(["SELECT", "INSERT", "UPDATE"])
+            query_type = random.choice(QUERY_TYPES)
             
             try:
-                start_time = time.time()
+                if query_type == "INSERT":
+                    # Build the batch before timing so only database work is measured
+                    rows = []
+                    for j in range(INSERT_BATCH_SIZE):
+                        username = f"user_{thread_id}_{i}_{j}"
+                        rows.append((username, f"{username}@example.com", "First", "Last", "active"))
+                
+                start_time = time.perf_counter_ns()
                 
                 if query_type == "SELECT":
                     # Simple SELECT query
@@ -61,12 +89,10 @@ def run_benchmark_thread(thread_id):
                     results = cursor.fetchall()
                 
                 elif query_type == "INSERT":
-                    # Simple INSERT query
-                    username = f"user_{thread_id}_{i}"
-                    email = f"{username}@example.com"
-                    cursor.execute(
+                    # Multi-row INSERT of INSERT_BATCH_SIZE rows, recorded as one sample
+                    cursor.executemany(
                         "INSERT INTO users (username, email, first_name, last_name, status) VALUES (%s, %s, %s, %s, %s)",
-                        (username, email, "First", "Last", "active")
+                        rows
                     )
                     connection.commit()
                 
@@ -75,17 +101,19 @@ def run_benchmark_thread(thread_id):
                     cursor.execute("UPDATE users SET status = 'active' WHERE id = 1")
                     connection.commit()
                 
-                execution_time = time.time() - start_time
+                # Integer nanoseconds; converted to seconds in the report
+                execution_time = time.perf_counter_ns() - start_time
                 query_times.append((query_type, execution_time))
                 
-                # Small delay to avoid hammering the database
-                time.sleep(0.1)
+                # Optional delay between queries to simulate client think time
+                if THINK_TIME_MS:
+                    time.sleep(THINK_TIME_MS / 1000.0)
             
             except Exception as e:
                 logger.error(f"Thread {thread_id} error: {e}")
                 errors += 1
         
-        # Close database connection
+        # Return the connection to the pool
         cursor.close()
         connection.close()
         
@@ -100,24 +128,25 @@ def main():
     logger.info(f"Testing against {NUM_DATABASES} database(s): {', '.join(DB_NAMES)}")
     logger.info(f"Each thread will execute {QUERIES_PER_THREAD} queries")
     
+    # Connect before timing so connection setup is not part of the results
+    pools = create_connection_pools(NUM_THREADS)
+    
     start_time = time.time()
     
     # Run threads
     with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
-        futures = [executor.submit(run_benchmark_thread, i) for i in range(NUM_THREADS)]
+        futures = [executor.submit(run_benchmark_thread, i, pools) for i in range(NUM_THREADS)]
         
-        # Wait for all threads to complete
-        all_query_times = {}
+        # Collect results as threads finish
+        all_query_times = {query_type: [] for query_type in QUERY_TYPES}
         total_errors = 0
         
-        for future in futures:
+        for future in as_completed(futures):
             query_times, errors = future.result()
             total_errors += errors
             
             # Group query times by type
             for query_type, execution_time in query_times:
-                if query_type not in all_query_times:
-                    all_query_times[query_type] = []
                 all_query_times[query_type].append(execution_time)
     
     end_time = time.time()
@@ -136,10 +165,10 @@ def main():
     
     for query_type, times in all_query_times.items():
         if times:
-            avg_time = statistics.mean(times)
-            median_time = statistics.median(times)
-            min_time = min(times)
-            max_time = max(times)
+            # Nanoseconds to seconds, then min/median/max from one sort
+            arr = np.fromiter(times, dtype=np.float64, count=len(times)) / 1e9
+            min_time, median_time, max_time = np.percentile(arr, [0, 50, 100])
+            avg_time = arr.mean()
             
             logger.info(f"{query_type} queries:")
             logger.info(f"  Count: {len(times)}")